@@ -5,11 +5,18 @@ from dotenv import load_dotenv
 from telegram.ext import Application, MessageHandler, filters
 from telegram import Update
 import sqlite3
+import aiosqlite
+from aiosqlitepool import SQLiteConnectionPool
+from pybloom_live import ScalableBloomFilter
 import hashlib
+import re
+from collections import OrderedDict
 from datetime import datetime, timedelta
 import signal
 import sys
-import pytz
+import time
+import weakref
+from zoneinfo import ZoneInfo
 
 # Setup logging
 try:
@@ -17,8 +24,11 @@ try:
 except AttributeError:
     pass
 
+# Zona waktu Jakarta, dibuat sekali dan dipakai ulang
+JAKARTA_TZ = ZoneInfo('Asia/Jakarta')
+
 # Set timezone untuk logging
-logging.Formatter.converter = lambda *args: datetime.now(pytz.timezone('Asia/Jakarta')).timetuple()
+logging.Formatter.converter = lambda *args: datetime.now(JAKARTA_TZ).timetuple()
 
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -31,6 +41,66 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Jendela deteksi duplikat dan masa simpan pesan (detik)
+DUPLICATE_WINDOW = 24 * 3600
+RETENTION_PERIOD = 7 * 24 * 3600
+
+# Interval pembersihan pesan lama dan checkpoint WAL (detik)
+CLEANUP_INTERVAL = 3600
+CHECKPOINT_INTERVAL = 300
+
+# Jeda pengumpulan INSERT sebelum ditulis dalam satu transaksi (detik)
+INSERT_BATCH_DELAY = 0.05
+# Jeda sebelum mencoba ulang batch yang gagal ditulis (detik)
+FLUSH_RETRY_DELAY = 1
+
+# Nomor HP Indonesia (08xx / 628xx / +628xx), boleh dipisah spasi, titik atau strip.
+# Seluruh deretan kelompok digit diambil (kelompok setelah pemisah minimal 2 digit,
+# jadi "2 pcs" tidak ikut), lalu panjangnya divalidasi di extract_phone_number
+PHONE_PATTERN = re.compile(r'(?<!\d)(?:\+?62|0)[ .-]?8\d*(?:[ .-]\d{2,})*')
+PHONE_MIN_DIGITS = 10
+PHONE_MAX_DIGITS = 13
+NON_DIGIT_PATTERN = re.compile(r'\D')
+
+# Jumlah maksimum pesan terbaru yang disimpan di memori
+RECENT_CACHE_SIZE = 10000
+
+# Ukuran awal dan tingkat false positive Bloom filter per chat
+BLOOM_CAPACITY = 10000
+BLOOM_ERROR_RATE = 0.001
+
+# Skema tabel partisi harian messages_YYYYMMDD
+PARTITION_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY,
+        chat_id INTEGER,
+        message_hash TEXT,
+        message_text TEXT,
+        user_id INTEGER,
+        ts INTEGER,
+        user_name TEXT,
+        UNIQUE(chat_id, message_hash)
+    )
+'''
+
+# Template balasan untuk pesan duplikat
+DUPLICATE_TEMPLATE = (
+    "❌DETEKSI SISTEM❌\n"
+    "TEXT: %s\n"
+    "%s : %s (pertama kali)\n"
+    "%s : %s (kali ini)"
+)
+
+# PRAGMA untuk setiap koneksi SQLite.
+# WAL hanya aman jika file DB berada di filesystem lokal (bukan network mount)
+SQLITE_PRAGMAS = '''
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-20000;
+'''
+
 class ProductionDuplicateBot:
     def __init__(self):
         env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
@@ -40,9 +110,30 @@ class ProductionDuplicateBot:
             raise ValueError("❌ BOT_TOKEN environment variable not set")
             
         # Set zona waktu Jakarta
-        self.timezone = pytz.timezone('Asia/Jakarta')
+        self.timezone = JAKARTA_TZ
             
-        self.app = Application.builder().token(self.token).build()
+        # Cache LRU (chat_id, message_hash) -> baris pesan pertama
+        self._recent_messages = OrderedDict()
+        # Bloom filter per chat untuk jendela 24 jam; generasi sebelumnya tetap
+        # dicek agar pesan menjelang rotasi tidak terlewat
+        self._blooms = {}
+        self._previous_blooms = {}
+        self._blooms_rotated_at = time.monotonic()
+        # Lock per chat; lock yang tidak lagi dipakai atau ditunggu otomatis hilang
+        self._chat_locks = weakref.WeakValueDictionary()
+        # Antrian INSERT yang ditulis oleh _flush_loop
+        self._pending_inserts = []
+        self._pending_event = asyncio.Event()
+        self._flush_task = None
+        self._stopping = False
+        self._background_tasks = []
+        self.app = (
+            Application.builder()
+            .token(self.token)
+            .post_init(self.post_init)
+            .post_shutdown(self.post_shutdown)
+            .build()
+        )
         self.setup_database()
         self.setup_handlers()
         self.setup_error_handler()
@@ -52,29 +143,78 @@ class ProductionDuplicateBot:
         
     def setup_database(self):
         """Setup database dengan path yang lebih baik"""
-        db_path = os.getenv('DB_PATH', 'messages.db')
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS messages (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                chat_id INTEGER,
-                message_hash TEXT,
-                message_text TEXT,
-                user_id INTEGER,
-                timestamp DATETIME,
-                UNIQUE(chat_id, message_hash)
-            )
-        ''')
-        
-        # Migrasi: Tambahkan kolom user_name jika belum ada
+        self.db_path = os.getenv('DB_PATH', 'messages.db')
+        # Skema dibuat sekali saat startup dengan koneksi sinkron
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        conn.executescript(SQLITE_PRAGMAS)
+        cursor = conn.cursor()
+        
+        # Pesan disimpan per hari (UTC) di tabel messages_YYYYMMDD
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB 'messages_[0-9]*'")
+        self._partitions = {row[0] for row in cursor.fetchall()}
+        
+        # Migrasi: Pindahkan tabel messages lama ke partisi harian
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'messages'")
+        if cursor.fetchone():
+            self.migrate_legacy_table(cursor)
+            
+        cursor.execute('ANALYZE')
+        conn.close()
+
+        # Query saat runtime lewat pool aiosqlite agar event loop tidak terblokir
+        self.pool = SQLiteConnectionPool(self._create_connection)
+        logger.info("📊 Database initialized at: %s", self.db_path)
+
+    def partition_name(self, ts):
+        """Nama tabel partisi harian (UTC) untuk UNIX timestamp"""
+        return time.strftime('messages_%Y%m%d', time.gmtime(ts))
+
+    def migrate_legacy_table(self, cursor):
+        """Pindahkan pesan dari tabel messages tunggal ke partisi harian"""
+        # Seluruh migrasi dalam satu transaksi: jika proses mati di tengah jalan,
+        # tabel lama tetap utuh dan migrasi diulang saat startup berikutnya
+        cursor.execute('BEGIN IMMEDIATE')
         try:
-            cursor.execute('ALTER TABLE messages ADD COLUMN user_name TEXT DEFAULT "Unknown"')
-        except sqlite3.OperationalError:
-            pass # Kolom sudah ada
+            # Kolom user_name dan ts mungkin belum ada di database lama
+            try:
+                cursor.execute('ALTER TABLE messages ADD COLUMN user_name TEXT DEFAULT "Unknown"')
+            except sqlite3.OperationalError:
+                pass # Kolom sudah ada
+            try:
+                cursor.execute('ALTER TABLE messages ADD COLUMN ts INTEGER')
+            except sqlite3.OperationalError:
+                pass # Kolom sudah ada
+            # Kolom timestamp lama disimpan dalam waktu Jakarta (UTC+7)
+            cursor.execute('''
+                UPDATE messages SET ts = CAST(strftime('%s', timestamp) AS INTEGER) - 7 * 3600
+                WHERE ts IS NULL AND timestamp IS NOT NULL
+            ''')
             
-        self.conn.commit()
-        logger.info(f"📊 Database initialized at: {db_path}")
+            cursor.execute('SELECT DISTINCT ts FROM messages WHERE ts >= ?',
+                           (int(time.time()) - RETENTION_PERIOD,))
+            tables = {self.partition_name(ts) for (ts,) in cursor.fetchall()}
+            for table in tables:
+                cursor.execute(PARTITION_SCHEMA.format(table=table))
+                cursor.execute(f'''
+                    INSERT OR IGNORE INTO {table}
+                    (chat_id, message_hash, message_text, user_id, ts, user_name)
+                    SELECT chat_id, message_hash, message_text, user_id, ts, user_name
+                    FROM messages WHERE strftime('messages_%Y%m%d', ts, 'unixepoch') = ?
+                ''', (table,))
+            cursor.execute('DROP TABLE messages')
+            cursor.execute('COMMIT')
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+        self._partitions.update(tables)
+        logger.info("📦 Migrated legacy messages table into %d partitions", len(tables))
+
+    async def _create_connection(self):
+        """Buat koneksi baru untuk pool dengan PRAGMA yang sama"""
+        # Transaksi dikontrol secara eksplisit, bukan oleh modul sqlite3
+        conn = await aiosqlite.connect(self.db_path, isolation_level=None)
+        await conn.executescript(SQLITE_PRAGMAS)
+        return conn
         
     def setup_handlers(self):
         """Setup handler untuk pesan teks"""
@@ -83,7 +223,7 @@ class ProductionDuplicateBot:
     def setup_error_handler(self):
         """Handle errors untuk production"""
         async def error_handler(update: Update, context):
-            logger.error(f"Error: {context.error}")
+            logger.error("Error: %s", context.error)
             
         self.app.add_error_handler(error_handler)
         
@@ -96,17 +236,142 @@ class ProductionDuplicateBot:
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
         
+    async def post_init(self, application):
+        """Jalankan tugas latar belakang setelah aplikasi siap"""
+        await self.load_bloom_filters()
+        self._background_tasks.append(asyncio.create_task(
+            self._run_periodically(CLEANUP_INTERVAL, self.cleanup_old_messages)))
+        self._background_tasks.append(asyncio.create_task(
+            self._run_periodically(CHECKPOINT_INTERVAL, self.checkpoint_wal)))
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def post_shutdown(self, application):
+        """Hentikan tugas latar belakang dan tutup pool database"""
+        for task in self._background_tasks:
+            task.cancel()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        self._background_tasks.clear()
+        
+        # _flush_loop tidak di-cancel agar batch yang sedang ditulis selesai
+        self._stopping = True
+        self._pending_event.set()
+        if self._flush_task is not None:
+            await self._flush_task
+            self._flush_task = None
+        await self.flush_pending_inserts()
+        await self.pool.close()
+
+    async def flush_pending_inserts(self):
+        """Tulis semua INSERT yang tertunda dalam satu transaksi"""
+        batch, self._pending_inserts = self._pending_inserts, []
+        if not batch:
+            return
+        
+        partitions = {}
+        for row in batch:
+            partitions.setdefault(self.partition_name(row[4]), []).append(row)
+        
+        try:
+            async with self.pool.connection() as conn:
+                await conn.execute('BEGIN IMMEDIATE')
+                try:
+                    for table, rows in partitions.items():
+                        if table not in self._partitions:
+                            await conn.execute(PARTITION_SCHEMA.format(table=table))
+                        # Baris yang sudah ada di partisi hari yang sama pasti masih
+                        # dalam jendela 24 jam, jadi pengirim pertama dipertahankan
+                        await conn.executemany(f'''
+                            INSERT OR IGNORE INTO {table}
+                            (chat_id, message_hash, message_text, user_id, ts, user_name)
+                            VALUES (?, ?, ?, ?, ?, ?)
+                        ''', rows)
+                    await conn.execute('COMMIT')
+                except Exception:
+                    await conn.execute('ROLLBACK')
+                    raise
+        except BaseException:
+            # Kembalikan batch ke antrian agar tidak hilang saat gagal atau di-cancel
+            self._pending_inserts[:0] = batch
+            logger.error("Failed to save %d messages, requeued", len(batch))
+            raise
+        self._partitions.update(partitions)
+
+    async def _flush_loop(self):
+        """Kumpulkan INSERT selama INSERT_BATCH_DELAY lalu tulis sekaligus"""
+        while not self._stopping:
+            await self._pending_event.wait()
+            if not self._stopping:
+                await asyncio.sleep(INSERT_BATCH_DELAY)
+            self._pending_event.clear()
+            try:
+                await self.flush_pending_inserts()
+            except Exception as e:
+                logger.error("Error flushing messages: %s", e)
+                if not self._stopping:
+                    # Coba lagi batch yang dikembalikan ke antrian
+                    await asyncio.sleep(FLUSH_RETRY_DELAY)
+                    self._pending_event.set()
+
+    async def cleanup_old_messages(self):
+        """Bersihkan pesan lebih dari 7 hari, cache LRU dan Bloom filter yang kedaluwarsa"""
+        cutoff = int(time.time()) - DUPLICATE_WINDOW
+        expired = [key for key, row in self._recent_messages.items() if row[2] <= cutoff]
+        for key in expired:
+            del self._recent_messages[key]
+        self.rotate_bloom_filters()
+        
+        # Partisi yang lebih tua dari masa simpan cukup di-DROP
+        oldest = self.partition_name(int(time.time()) - RETENTION_PERIOD)
+        expired_tables = sorted(table for table in self._partitions if table < oldest)
+        if not expired_tables:
+            return
+        
+        async with self.pool.connection() as conn:
+            for table in expired_tables:
+                await conn.execute(f'DROP TABLE IF EXISTS {table}')
+                self._partitions.discard(table)
+
+    async def checkpoint_wal(self):
+        """Pindahkan isi WAL ke file database tanpa memblokir penulis"""
+        async with self.pool.connection() as conn:
+            await conn.execute('PRAGMA wal_checkpoint(PASSIVE)')
+
+    async def _run_periodically(self, interval, job):
+        """Jalankan job secara berkala, bukan di setiap pesan"""
+        while True:
+            try:
+                await job()
+            except Exception as e:
+                logger.error("Error running %s: %s", job.__name__, e)
+            await asyncio.sleep(interval)
+
     async def graceful_shutdown(self):
         """Shutdown yang graceful"""
         logger.info("🔚 Shutting down gracefully...")
-        self.conn.close()
+        await self.post_shutdown(self.app)
         await self.app.shutdown()
         sys.exit(0)
         
     def generate_message_hash(self, text):
         """Generate hash untuk pesan untuk deteksi duplikat"""
-        normalized_text = ' '.join(text.lower().split())
-        return hashlib.md5(normalized_text.encode()).hexdigest()
+        # str.split()/join lebih cepat daripada re.sub untuk merapikan spasi
+        normalized_text = ' '.join(text.split()).lower()
+        return hashlib.blake2b(normalized_text.encode(), digest_size=16).hexdigest()
+        
+    @staticmethod
+    def extract_phone_number(text):
+        """Ambil nomor HP pertama dalam pesan dalam bentuk kanonik (08xx)"""
+        match = PHONE_PATTERN.search(text)
+        if not match:
+            return None
+        digits = NON_DIGIT_PATTERN.sub('', match.group(0))
+        if digits.startswith('62'):
+            digits = '0' + digits[2:]
+        # Jangan pernah mengembalikan nomor terpotong; pesan dengan deretan
+        # digit di luar panjang nomor HP memakai hash teks lengkap
+        if not PHONE_MIN_DIGITS <= len(digits) <= PHONE_MAX_DIGITS:
+            return None
+        return digits
         
     def get_current_time(self):
         """Mendapatkan waktu saat ini dalam zona waktu Jakarta"""
@@ -122,14 +387,76 @@ class ProductionDuplicateBot:
         """Format waktu untuk ditampilkan ke user"""
         try:
             # Parse waktu dari database
-            dt = datetime.strptime(dt_str, '%Y-%m-%d %H:%M:%S')
+            dt = datetime.fromisoformat(dt_str)
             # Pastikan waktu memiliki timezone Jakarta
             if dt.tzinfo is None:
-                dt = self.timezone.localize(dt)
+                dt = dt.replace(tzinfo=self.timezone)
             return dt.strftime('%Y/%m/%d %H:%M:%S')
         except Exception as e:
-            logger.error(f"Error formatting time: {e}")
+            logger.error("Error formatting time: %s", e)
             return dt_str
+
+    def format_ts_display(self, ts):
+        """Format UNIX timestamp dari database untuk ditampilkan ke user"""
+        return datetime.fromtimestamp(ts, self.timezone).strftime('%Y/%m/%d %H:%M:%S')
+        
+    async def find_recent_message(self, chat_id, message_hash, now):
+        """Cari pesan pertama dalam jendela 24 jam di partisi hari ini dan kemarin"""
+        cutoff = now - DUPLICATE_WINDOW
+        tables = sorted({self.partition_name(cutoff), self.partition_name(now)} & self._partitions)
+        if not tables:
+            return None
+        
+        query = ' UNION ALL '.join(
+            f'SELECT user_id, message_text, ts, user_name FROM {table} '
+            'WHERE chat_id = ? AND message_hash = ? AND ts > ?'
+            for table in tables
+        ) + ' ORDER BY ts LIMIT 1'
+        async with self.pool.connection() as conn:
+            async with conn.execute(query, (chat_id, message_hash, cutoff) * len(tables)) as cursor:
+                return await cursor.fetchone()
+        
+    async def load_bloom_filters(self):
+        """Isi Bloom filter dari pesan dalam jendela 24 jam saat startup"""
+        cutoff = int(time.time()) - DUPLICATE_WINDOW
+        tables = {self.partition_name(cutoff), self.partition_name(time.time())} & self._partitions
+        async with self.pool.connection() as conn:
+            for table in tables:
+                async with conn.execute(
+                    f'SELECT chat_id, message_hash FROM {table} WHERE ts > ?', (cutoff,)
+                ) as cursor:
+                    async for chat_id, message_hash in cursor:
+                        self.mark_seen(chat_id, message_hash)
+
+    def rotate_bloom_filters(self):
+        """Ganti generasi Bloom filter setiap DUPLICATE_WINDOW"""
+        if time.monotonic() - self._blooms_rotated_at < DUPLICATE_WINDOW:
+            return
+        self._previous_blooms, self._blooms = self._blooms, {}
+        self._blooms_rotated_at = time.monotonic()
+
+    def might_be_duplicate(self, chat_id, message_hash):
+        """False berarti pesan pasti belum pernah dikirim dalam 24 jam terakhir"""
+        for blooms in (self._blooms, self._previous_blooms):
+            bloom = blooms.get(chat_id)
+            if bloom is not None and message_hash in bloom:
+                return True
+        return False
+
+    def mark_seen(self, chat_id, message_hash):
+        """Tambahkan hash pesan ke Bloom filter chat"""
+        bloom = self._blooms.get(chat_id)
+        if bloom is None:
+            bloom = self._blooms[chat_id] = ScalableBloomFilter(
+                initial_capacity=BLOOM_CAPACITY, error_rate=BLOOM_ERROR_RATE)
+        bloom.add(message_hash)
+        
+    def remember_message(self, key, row):
+        """Simpan baris pesan ke cache LRU"""
+        self._recent_messages[key] = row
+        self._recent_messages.move_to_end(key)
+        if len(self._recent_messages) > RECENT_CACHE_SIZE:
+            self._recent_messages.popitem(last=False)
         
     async def handle_message(self, update: Update, context):
         """Handle incoming messages"""
@@ -138,69 +465,77 @@ class ProductionDuplicateBot:
             if not message or not message.text:
                 return
                 
-            chat_id = message.chat_id
-            user_id = message.from_user.id
-            user_name = message.from_user.first_name if message.from_user.first_name else str(user_id)
             message_text = message.text
             
             # Skip jika pesan terlalu pendek (dikurangi jadi 5 agar fitur No HP terdeteksi)
             if len(message_text.strip()) < 5:  
                 return
                 
-            message_hash = self.generate_message_hash(message_text)
+            # Data chat dan pengirim hanya dibaca untuk pesan yang lolos filter
+            chat_id = message.chat_id
+            user_id = message.from_user.id
+            user_name = message.from_user.first_name if message.from_user.first_name else str(user_id)
             
-            cursor = self.conn.cursor()
+            # Pesan berisi nomor HP dideteksi berdasarkan nomornya saja,
+            # sehingga 0812..., +62812... dan 62 812-... dianggap sama
+            phone_number = self.extract_phone_number(message_text)
+            message_hash = self.generate_message_hash(phone_number or message_text)
+            now = int(time.time())
             
-            # Cek apakah pesan sudah pernah dikirim dalam 24 jam terakhir
-            cursor.execute('''
-                SELECT user_id, message_text, timestamp, user_name 
-                FROM messages 
-                WHERE chat_id = ? AND message_hash = ? 
-                AND timestamp > datetime('now', '-1 day')
-            ''', (chat_id, message_hash))
+            key = (chat_id, message_hash)
             
-            existing_message = cursor.fetchone()
+            # Cek dan catat pesan diserialisasi per chat agar dua pesan sama
+            # yang diproses bersamaan tidak sama-sama dianggap baru
+            lock = self._chat_locks.get(chat_id)
+            if lock is None:
+                lock = self._chat_locks[chat_id] = asyncio.Lock()
+            async with lock:
+                # Cek cache terlebih dahulu sebelum ke database
+                existing_message = self._recent_messages.get(key)
+                if existing_message and existing_message[2] <= now - DUPLICATE_WINDOW:
+                    existing_message = None
+                
+                if existing_message:
+                    self._recent_messages.move_to_end(key)
+                else:
+                    # Bloom filter menjawab "belum pernah" tanpa query ke database;
+                    # database hanya dicek untuk kemungkinan duplikat
+                    if self.might_be_duplicate(chat_id, message_hash):
+                        existing_message = await self.find_recent_message(chat_id, message_hash, now)
+                
+                    if not existing_message:
+                        self.mark_seen(chat_id, message_hash)
+                        # Simpan pesan baru secara batch; cache LRU menangkap duplikat
+                        # yang datang sebelum batch ditulis ke database
+                        self._pending_inserts.append(
+                            (chat_id, message_hash, message_text, user_id, now, user_name))
+                        self._pending_event.set()
+                    
+                    self.remember_message(key, existing_message or (user_id, message_text, now, user_name))
             
             if existing_message:
-                original_user_id, original_text, original_time, original_user_name = existing_message
+                original_user_id, original_text, original_ts, original_user_name = existing_message
                 
                 # Format waktu untuk ditampilkan
-                original_time_str = self.format_time_display(original_time)
-                current_time_str = self.format_time_display(self.format_time_for_db())
+                original_time_str = self.format_ts_display(original_ts)
+                current_time_str = self.format_ts_display(now)
                 
-                response_message = (
-                    f"❌DETEKSI SISTEM❌\n"
-                    f"TEXT: {original_text}\n"
-                    f"{original_user_name} : {original_time_str} (pertama kali)\n"
-                    f"{user_name} : {current_time_str} (kali ini)"
-                )
+                response_message = DUPLICATE_TEMPLATE % (
+                    original_text, original_user_name, original_time_str,
+                    user_name, current_time_str)
                 
-                msg = await message.reply_text(response_message)
-                logger.info(f"🚫 Duplicate detected in chat {chat_id} at {current_time_str} WIB")
+                await message.reply_text(response_message)
+                logger.info("🚫 Duplicate detected in chat %s at %s WIB", chat_id, current_time_str)
             else:
-                # Simpan pesan baru ke database dengan waktu Jakarta
-                current_time = self.format_time_for_db()
-                
-                cursor.execute('''
-                    INSERT OR REPLACE INTO messages 
-                    (chat_id, message_hash, message_text, user_id, timestamp, user_name)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (chat_id, message_hash, message_text, user_id, current_time, user_name))
-                self.conn.commit()
-                
-                logger.info(f"✅ New message saved at {current_time} WIB")
-                
-            # Bersihkan pesan yang lebih dari 7 hari
-            cursor.execute('DELETE FROM messages WHERE timestamp < datetime("now", "-7 days")')
-            self.conn.commit()
+                logger.info("✅ New message queued in chat %s", chat_id)
             
         except Exception as e:
-            logger.error(f"Error handling message: {e}")
+            logger.error("Error handling message: %s", e)
         
     def run_polling(self):
         """Jalankan dengan polling (untuk development)"""
         current_time = self.format_time_display(self.format_time_for_db())
-        logger.info(f"🔄 Starting bot with polling at {current_time} WIB...")
+        logger.info("🔄 Starting bot with polling at %s WIB...", current_time)
         self.app.run_polling(
             drop_pending_updates=True,
             allowed_updates=Update.ALL_TYPES
@@ -216,7 +551,7 @@ class ProductionDuplicateBot:
             return self.run_polling()
             
         current_time = self.format_time_display(self.format_time_for_db())
-        logger.info(f"🌐 Starting bot with webhook: {webhook_url} at {current_time} WIB")
+        logger.info("🌐 Starting bot with webhook: %s at %s WIB", webhook_url, current_time)
         self.app.run_webhook(
             listen="0.0.0.0",
             port=port,
@@ -236,5 +571,5 @@ if __name__ == "__main__":
             bot.run_polling()
             
     except Exception as e:
-        logger.error(f"❌ Failed to start bot: {e}")
+        logger.error("❌ Failed to start bot: %s", e)
         sys.exit(1)
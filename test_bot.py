@@ -0,0 +1,37 @@
+import unittest
+
+from bot import ProductionDuplicateBot
+
+
+class ExtractPhoneNumberTest(unittest.TestCase):
+    def assertPhone(self, text, expected):
+        self.assertEqual(ProductionDuplicateBot.extract_phone_number(text), expected, text)
+
+    def test_common_formats(self):
+        self.assertPhone('0812-3456-7890', '081234567890')
+        self.assertPhone('+62 812 3456 7890', '081234567890')
+        self.assertPhone('6281234567890', '081234567890')
+        self.assertPhone('0812.345.678', '0812345678')
+        self.assertPhone('081 2345 6789', '08123456789')
+
+    def test_quantity_after_number_is_excluded(self):
+        self.assertPhone('081234567890 2 pcs', '081234567890')
+        self.assertPhone('Budi 081234567890 1 pcs', '081234567890')
+
+    def test_four_groups_are_not_truncated(self):
+        self.assertPhone('0812-345-678-901', '0812345678901')
+        self.assertPhone('0812-345-678-902', '0812345678902')
+        self.assertPhone('+62 812 345 678 90', '081234567890')
+
+    def test_invalid_length_falls_back_to_text(self):
+        self.assertPhone('0813 1234 5678 90', None)
+        self.assertPhone('08123456789012', None)
+        self.assertPhone('call 08123 ok', None)
+        self.assertPhone('id 12340812345678901234', None)
+
+    def test_no_phone_number(self):
+        self.assertPhone('hello world there', None)
+
+
+if __name__ == '__main__':
+    unittest.main()